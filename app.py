@@ -4,13 +4,20 @@ Flask CRUD API
 A RESTful API with full CRUD operations for managing items in a SQLite database
 """
 
-from flask import Flask, request, jsonify, g
+from flask import Flask, request
 from flask_cors import CORS
 import sqlite3
+import orjson
 import json
+import base64
+import binascii
 from datetime import datetime
 import os
 import logging
+import threading
+import time
+from functools import lru_cache
+from itertools import chain, combinations
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,23 +30,81 @@ CORS(app)  # Enable CORS for all routes
 DATABASE = 'items.db'
 app.config['DATABASE'] = DATABASE
 
+# Static SQL, kept as constants so each connection's statement cache reuses
+# the prepared statements instead of re-parsing freshly built strings
+SQL_GET_ITEM = 'SELECT * FROM items WHERE id = ?'
+SQL_INSERT = 'INSERT INTO items (name, description, category, price, quantity) VALUES (?, ?, ?, ?, ?)'
+SQL_DELETE = 'DELETE FROM items WHERE id = ?'
+SQL_SELECT_ITEMS = 'SELECT * FROM items'
+SQL_COUNT_ITEMS = 'SELECT COUNT(*) FROM items'
+SQL_CATEGORIES = 'SELECT DISTINCT category FROM items WHERE category IS NOT NULL ORDER BY category'
+
+# Updatable columns and a prebuilt UPDATE statement for every non-empty subset
+# of them, keyed by frozenset. Each statement sets updated_at itself so the
+# row is written once and RETURNING reports the new timestamp.
+UPDATE_FIELDS = ('name', 'description', 'category', 'price', 'quantity')
+UPDATE_SQL = {
+    frozenset(subset): (
+        f'UPDATE items SET {", ".join(f"{field} = ?" for field in subset)}, '
+        'updated_at = CURRENT_TIMESTAMP WHERE id = ? RETURNING *'
+    )
+    for subset in chain.from_iterable(
+        combinations(UPDATE_FIELDS, size) for size in range(1, len(UPDATE_FIELDS) + 1)
+    )
+}
+
+# Sortable columns and the ORDER BY clause for each (field, order) pair;
+# id breaks ties so keyset pagination is stable
+SORT_FIELDS = frozenset({'id', 'name', 'category', 'price', 'quantity', 'created_at'})
+ORDER_CLAUSES = {
+    (field, order): f' ORDER BY {field} {order.upper()}, id {order.upper()}'
+    for field in SORT_FIELDS for order in ('asc', 'desc')
+}
+
+# Numeric item fields: (field, types accepted as-is, converter, error message)
+NUMERIC_FIELDS = (
+    ('price', (int, float), float, "'price' must be a valid number"),
+    ('quantity', int, int, "'quantity' must be a valid integer"),
+)
+
+# Connection-scoped tuning, applied to every connection when it is opened.
+# journal_mode=WAL is persistent in the database file and is set in init_db.
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA foreign_keys=ON',
+)
+
+# Per-thread connection, opened once per worker thread and reused across requests
+_local = threading.local()
+
+def connect_db():
+    """Open a new tuned database connection"""
+    db = sqlite3.connect(app.config['DATABASE'], check_same_thread=False, isolation_level=None)
+    db.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        db.execute(pragma)
+    return db
+
 def get_db():
-    """Get database connection"""
-    if 'db' not in g:
-        g.db = sqlite3.connect(app.config['DATABASE'])
-        g.db.row_factory = sqlite3.Row
-    return g.db
-
-def close_db(e=None):
-    """Close database connection"""
-    db = g.pop('db', None)
-    if db is not None:
-        db.close()
+    """Get the database connection for the current thread"""
+    db = getattr(_local, 'db', None)
+    if db is None:
+        db = _local.db = connect_db()
+    return db
 
 def init_db():
     """Initialize the database with tables"""
-    with app.app_context():
-        db = get_db()
+    # Use a dedicated bootstrap connection so schema creation never races
+    # with request threads opening their own connections
+    db = connect_db()
+    try:
+        # WAL lets readers proceed during writes; it creates items.db-wal and
+        # items.db-shm next to the database file
+        db.execute('PRAGMA journal_mode=WAL')
+        has_fts = db.execute("SELECT 1 FROM sqlite_master WHERE name = 'items_fts'").fetchone()
         db.executescript("""
             CREATE TABLE IF NOT EXISTS items (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -52,15 +117,49 @@ def init_db():
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
             
-            CREATE TRIGGER IF NOT EXISTS update_timestamp 
-            AFTER UPDATE ON items
+            CREATE INDEX IF NOT EXISTS idx_items_category_id ON items(category, id);
+            CREATE INDEX IF NOT EXISTS idx_items_category_price ON items(category, price);
+            CREATE INDEX IF NOT EXISTS idx_items_name ON items(name);
+            CREATE INDEX IF NOT EXISTS idx_items_price ON items(price);
+            CREATE INDEX IF NOT EXISTS idx_items_quantity ON items(quantity);
+            CREATE INDEX IF NOT EXISTS idx_items_created_at ON items(created_at);
+            
+            -- Full-text index over name and description, kept in sync with items
+            CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                name, description, content='items', content_rowid='id'
+            );
+            
+            CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items
+            BEGIN
+                INSERT INTO items_fts (rowid, name, description)
+                VALUES (NEW.id, NEW.name, NEW.description);
+            END;
+            
+            CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items
+            BEGIN
+                INSERT INTO items_fts (items_fts, rowid, name, description)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description);
+            END;
+            
+            CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF name, description ON items
             BEGIN
-                UPDATE items SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                INSERT INTO items_fts (items_fts, rowid, name, description)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description);
+                INSERT INTO items_fts (rowid, name, description)
+                VALUES (NEW.id, NEW.name, NEW.description);
             END;
+            
+            -- updated_at is set by the UPDATE statements themselves (see
+            -- UPDATE_SQL); the old trigger rewrote every updated row a second time
+            DROP TRIGGER IF EXISTS update_timestamp;
         """)
         
+        # Index rows that existed before the full-text table was added
+        if not has_fts:
+            db.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+        
         # Insert sample data if table is empty
-        count = db.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+        count = db.execute(SQL_COUNT_ITEMS).fetchone()[0]
         if count == 0:
             sample_items = [
                 ('Laptop', 'High-performance laptop for development', 'Electronics', 999.99, 5),
@@ -70,23 +169,129 @@ def init_db():
                 ('Notebook', 'Spiral-bound notebook', 'Office', 4.99, 50)
             ]
             
-            for item in sample_items:
-                db.execute(
-                    'INSERT INTO items (name, description, category, price, quantity) VALUES (?, ?, ?, ?, ?)',
-                    item
-                )
+            # Single transaction: one prepared statement and one commit for all rows
+            with db:
+                db.execute('BEGIN')
+                db.executemany(SQL_INSERT, sample_items)
         
-        db.commit()
         logger.info("Database initialized successfully")
+    finally:
+        db.close()
 
-@app.teardown_appcontext
-def close_db(error):
-    """Close database connection at the end of request"""
-    close_db()
+def ojsonify(obj):
+    """Serialize obj to a JSON response using orjson"""
+    return app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 def dict_from_row(row):
     """Convert sqlite3.Row to dictionary"""
-    return {key: row[key] for key in row.keys()}
+    return dict(row)
+
+# Range of SQLite's 64-bit INTEGER; larger cursor ints cannot be bound
+SQLITE_INT_MIN = -2 ** 63
+SQLITE_INT_MAX = 2 ** 63 - 1
+
+def is_sqlite_int(value):
+    """Check that value is a (non-bool) int that fits in a SQLite INTEGER"""
+    return (isinstance(value, int) and not isinstance(value, bool)
+            and SQLITE_INT_MIN <= value <= SQLITE_INT_MAX)
+
+def encode_cursor(row, sort_by):
+    """Encode the (sort value, id) of the last row of a page as an opaque cursor"""
+    payload = json.dumps([row[sort_by], row['id']]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, returning (last_value, last_id)"""
+    try:
+        last_value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    # The cursor is client input: only accept values SQLite can bind
+    if last_value is not None and not (isinstance(last_value, (str, float))
+                                       or is_sqlite_int(last_value)):
+        raise ValueError('Invalid cursor')
+    if not is_sqlite_int(last_id):
+        raise ValueError('Invalid cursor')
+    return last_value, last_id
+
+def keyset_segments(sort_by, descending, last_value, last_id):
+    """Build the WHERE fragments selecting rows after (last_value, last_id)
+
+    Rows are ordered by (sort_by, id) in the given direction. SQLite sorts
+    NULLs first in ascending order and last in descending order, so the
+    result is a NULL segment and a non-NULL segment in some order. Each
+    fragment is an index seek; they are returned in the order they should be
+    read, and later ones are only needed when earlier ones run out of rows.
+    """
+    op = '<' if descending else '>'
+    if sort_by == 'id':
+        return [(f' AND id {op} ?', [last_id])]
+    if last_value is None:
+        segments = [(f' AND {sort_by} IS NULL AND id {op} ?', [last_id])]
+        if not descending:
+            segments.append((f' AND {sort_by} IS NOT NULL', []))
+        return segments
+    segments = [(f' AND ({sort_by}, id) {op} (?, ?)', [last_value, last_id])]
+    if descending:
+        segments.append((f' AND {sort_by} IS NULL', []))
+    return segments
+
+def fts_query(search):
+    """Turn free-text search into an FTS5 query matching every word as a prefix
+
+    Each word is quoted so characters with meaning in the FTS5 query syntax
+    are matched literally.
+    """
+    terms = ['"' + word.replace('"', '""') + '"*' for word in search.split()]
+    return ' '.join(terms)
+
+def build_filters(category, search):
+    """Build the WHERE clause and parameters shared by item listing queries"""
+    where = ' WHERE 1=1'
+    params = []
+    
+    if category:
+        where += ' AND category = ?'
+        params.append(category)
+    
+    match = fts_query(search) if search else None
+    if match:
+        where += ' AND id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)'
+        params.append(match)
+    
+    return where, params
+
+# Query-result caches are per process. A write clears the cache of the worker
+# that handled it; other workers pick the change up within CACHE_TTL seconds,
+# so their cached results are only eventually consistent.
+CACHE_TTL = 5.0
+
+def cache_epoch():
+    """Current CACHE_TTL-sized time bucket, used to expire cache entries"""
+    return int(time.monotonic() // CACHE_TTL)
+
+@lru_cache(maxsize=128)
+def count_items(generation, epoch, category, search):
+    """Count items matching the filters
+
+    generation and epoch only key the cache: a count computed before a write
+    or in an earlier epoch lands under a key that is never read again.
+    """
+    where, params = build_filters(category, search)
+    return get_db().execute(SQL_COUNT_ITEMS + where, params).fetchone()[0]
+
+# Cached result of get_categories as (epoch, categories), reset whenever items change
+_categories_cache = None
+# Bumped by every write handled in this process
+_cache_generation = 0
+_cache_lock = threading.Lock()
+
+def invalidate_caches():
+    """Drop cached query results after a write to the items table"""
+    global _categories_cache, _cache_generation
+    with _cache_lock:
+        _categories_cache = None
+        _cache_generation += 1
 
 def validate_item_data(data, required_fields=None):
     """Validate item data"""
@@ -100,27 +305,32 @@ def validate_item_data(data, required_fields=None):
         if field not in data or not data[field]:
             errors.append(f"'{field}' is required")
     
-    # Validate data types
-    if 'price' in data and data['price'] is not None:
-        try:
-            float(data['price'])
-        except (ValueError, TypeError):
-            errors.append("'price' must be a valid number")
-    
-    if 'quantity' in data and data['quantity'] is not None:
+    # Validate data types: values already arriving as JSON numbers skip the
+    # conversion attempt; anything else must convert cleanly
+    for field, fast_types, convert, message in NUMERIC_FIELDS:
+        value = data.get(field)
+        if value is None or isinstance(value, fast_types):
+            continue
         try:
-            int(data['quantity'])
-        except (ValueError, TypeError):
-            errors.append("'quantity' must be a valid integer")
+            convert(value)
+        except (ValueError, TypeError, OverflowError):
+            errors.append(message)
     
     return errors
 
+# Result of the last database probe made by health_check; probes within
+# HEALTH_CHECK_TTL seconds of it reuse the result instead of querying again
+HEALTH_CHECK_TTL = 1.0
+_health_checked_at = float('-inf')
+_health_error = None
+_health_lock = threading.Lock()
+
 # API Routes
 
 @app.route('/')
 def index():
     """API documentation endpoint"""
-    return jsonify({
+    return ojsonify({
         'message': 'Flask CRUD API',
         'version': '1.0.0',
         'endpoints': {
@@ -145,20 +355,29 @@ def index():
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    try:
-        db = get_db()
-        db.execute('SELECT 1').fetchone()
-        return jsonify({
+    global _health_checked_at, _health_error
+    with _health_lock:
+        now = time.monotonic()
+        if now - _health_checked_at >= HEALTH_CHECK_TTL:
+            try:
+                get_db().execute('SELECT 1').fetchone()
+                _health_error = None
+            except Exception as e:
+                _health_error = str(e)
+            _health_checked_at = now
+        error = _health_error
+    
+    if error is None:
+        return ojsonify({
             'status': 'healthy',
             'database': 'connected',
             'timestamp': datetime.now().isoformat()
         })
-    except Exception as e:
-        return jsonify({
-            'status': 'unhealthy',
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    return ojsonify({
+        'status': 'unhealthy',
+        'error': error,
+        'timestamp': datetime.now().isoformat()
+    }), 500
 
 @app.route('/items', methods=['GET'])
 def get_items():
@@ -168,56 +387,72 @@ def get_items():
         
         # Get query parameters
         page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 10, type=int), 100)  # Max 100 items per page
+        per_page = max(1, min(request.args.get('per_page', 10, type=int), 100))  # 1 to 100 items per page
         category = request.args.get('category')
         search = request.args.get('search')
         sort_by = request.args.get('sort_by', 'id')
         sort_order = request.args.get('sort_order', 'asc')
+        cursor_token = request.args.get('cursor')
         
-        # Build query
-        query = 'SELECT * FROM items WHERE 1=1'
-        params = []
-        
-        if category:
-            query += ' AND category = ?'
-            params.append(category)
+        include_total = request.args.get('include_total', type=int) == 1
         
-        if search:
-            query += ' AND (name LIKE ? OR description LIKE ?)'
-            search_term = f'%{search}%'
-            params.extend([search_term, search_term])
+        # Build query
+        where, params = build_filters(category, search)
+        query = SQL_SELECT_ITEMS + where
         
         # Add sorting
-        valid_sort_fields = ['id', 'name', 'category', 'price', 'quantity', 'created_at']
-        if sort_by in valid_sort_fields and sort_order.lower() in ['asc', 'desc']:
-            query += f' ORDER BY {sort_by} {sort_order.upper()}'
-        
-        # Get total count for pagination
-        count_query = query.replace('SELECT *', 'SELECT COUNT(*)')
-        total_items = db.execute(count_query, params).fetchone()[0]
-        
-        # Add pagination
-        offset = (page - 1) * per_page
-        query += ' LIMIT ? OFFSET ?'
-        params.extend([per_page, offset])
-        
-        # Execute query
-        cursor = db.execute(query, params)
-        items = [dict_from_row(row) for row in cursor.fetchall()]
+        order_clause = ORDER_CLAUSES.get((sort_by, sort_order.lower()))
+        if order_clause is None:
+            sort_by, sort_order = 'id', 'asc'
+            order_clause = ORDER_CLAUSES[(sort_by, sort_order)]
+        descending = sort_order.lower() == 'desc'
+        
+        # Add pagination: keyset when a cursor is given, OFFSET (deprecated) otherwise.
+        # One extra row is fetched to tell whether another page exists.
+        if cursor_token:
+            try:
+                last_value, last_id = decode_cursor(cursor_token)
+            except ValueError as e:
+                return ojsonify({'error': str(e)}), 400
+            
+            # Read segment by segment until the page (plus one row) is full
+            rows = []
+            for predicate, predicate_params in keyset_segments(sort_by, descending, last_value, last_id):
+                cursor = db.execute(query + predicate + order_clause + ' LIMIT ?',
+                                    params + predicate_params + [per_page + 1 - len(rows)])
+                rows.extend(cursor.fetchall())
+                if len(rows) > per_page:
+                    break
+        else:
+            offset = (page - 1) * per_page
+            query += order_clause + ' LIMIT ? OFFSET ?'
+            params.extend([per_page + 1, offset])
+            cursor = db.execute(query, params)
+            rows = cursor.fetchall()
+        
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        columns = [column[0] for column in cursor.description]
+        items = [dict(zip(columns, row)) for row in rows]
         
         # Calculate pagination info
-        total_pages = (total_items + per_page - 1) // per_page
+        pagination = {
+            'page': page,
+            'per_page': per_page,
+            'has_more': has_more,
+            'has_next': has_more,
+            'has_prev': bool(cursor_token) or page > 1,
+            'next_cursor': encode_cursor(rows[-1], sort_by) if has_more and rows else None
+        }
+        
+        if include_total:
+            total_items = count_items(_cache_generation, cache_epoch(), category, search)
+            pagination['total_items'] = total_items
+            pagination['total_pages'] = (total_items + per_page - 1) // per_page
         
-        return jsonify({
+        return ojsonify({
             'items': items,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total_items': total_items,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
-            },
+            'pagination': pagination,
             'filters': {
                 'category': category,
                 'search': search,
@@ -228,24 +463,24 @@ def get_items():
         
     except Exception as e:
         logger.error(f"Error getting items: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route('/items/<int:item_id>', methods=['GET'])
 def get_item(item_id):
     """Get a specific item by ID"""
     try:
         db = get_db()
-        cursor = db.execute('SELECT * FROM items WHERE id = ?', (item_id,))
+        cursor = db.execute(SQL_GET_ITEM, (item_id,))
         item = cursor.fetchone()
         
         if item is None:
-            return jsonify({'error': 'Item not found'}), 404
+            return ojsonify({'error': 'Item not found'}), 404
         
-        return jsonify({'item': dict_from_row(item)})
+        return ojsonify({'item': dict_from_row(item)})
         
     except Exception as e:
         logger.error(f"Error getting item {item_id}: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route('/items', methods=['POST'])
 def create_item():
@@ -254,18 +489,15 @@ def create_item():
         data = request.get_json()
         
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return ojsonify({'error': 'No JSON data provided'}), 400
         
         # Validate required fields
         errors = validate_item_data(data, required_fields=['name'])
         if errors:
-            return jsonify({'error': 'Validation failed', 'details': errors}), 400
+            return ojsonify({'error': 'Validation failed', 'details': errors}), 400
         
         db = get_db()
-        cursor = db.execute("""
-            INSERT INTO items (name, description, category, price, quantity)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
+        cursor = db.execute(SQL_INSERT, (
             data['name'],
             data.get('description'),
             data.get('category'),
@@ -274,18 +506,19 @@ def create_item():
         ))
         
         db.commit()
+        invalidate_caches()
         item_id = cursor.lastrowid
         
         # Return the created item
-        cursor = db.execute('SELECT * FROM items WHERE id = ?', (item_id,))
+        cursor = db.execute(SQL_GET_ITEM, (item_id,))
         item = dict_from_row(cursor.fetchone())
         
         logger.info(f"Created item with ID: {item_id}")
-        return jsonify({'message': 'Item created successfully', 'item': item}), 201
+        return ojsonify({'message': 'Item created successfully', 'item': item}), 201
         
     except Exception as e:
         logger.error(f"Error creating item: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route('/items/<int:item_id>', methods=['PUT'])
 def update_item(item_id):
@@ -294,49 +527,44 @@ def update_item(item_id):
         data = request.get_json()
         
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
-        
-        # Check if item exists
-        db = get_db()
-        cursor = db.execute('SELECT * FROM items WHERE id = ?', (item_id,))
-        existing_item = cursor.fetchone()
-        
-        if existing_item is None:
-            return jsonify({'error': 'Item not found'}), 404
+            return ojsonify({'error': 'No JSON data provided'}), 400
         
         # Validate data
         errors = validate_item_data(data)
         if errors:
-            return jsonify({'error': 'Validation failed', 'details': errors}), 400
-        
-        # Build update query dynamically
-        update_fields = []
-        params = []
+            return ojsonify({'error': 'Validation failed', 'details': errors}), 400
         
-        for field in ['name', 'description', 'category', 'price', 'quantity']:
-            if field in data:
-                update_fields.append(f'{field} = ?')
-                params.append(data[field])
+        # Look up the prebuilt statement; parameters follow UPDATE_FIELDS order
+        present = [field for field in UPDATE_FIELDS if field in data]
         
-        if not update_fields:
-            return jsonify({'error': 'No valid fields to update'}), 400
+        if not present:
+            return ojsonify({'error': 'No valid fields to update'}), 400
         
+        query = UPDATE_SQL[frozenset(present)]
+        params = [data[field] for field in present]
         params.append(item_id)
-        query = f'UPDATE items SET {", ".join(update_fields)} WHERE id = ?'
         
-        db.execute(query, params)
+        # Update and read back in one statement; no row means the item does not exist
+        db = get_db()
+        rows = db.execute(query, params).fetchall()
+        
+        if not rows:
+            return ojsonify({'error': 'Item not found'}), 404
+        
         db.commit()
+        invalidate_caches()
+        item = dict_from_row(rows[0])
         
-        # Return updated item
-        cursor = db.execute('SELECT * FROM items WHERE id = ?', (item_id,))
-        item = dict_from_row(cursor.fetchone())
+        # RETURNING reports integral REAL values as ints; match what GET returns
+        if isinstance(item['price'], int):
+            item['price'] = float(item['price'])
         
         logger.info(f"Updated item with ID: {item_id}")
-        return jsonify({'message': 'Item updated successfully', 'item': item})
+        return ojsonify({'message': 'Item updated successfully', 'item': item})
         
     except Exception as e:
         logger.error(f"Error updating item {item_id}: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route('/items/<int:item_id>', methods=['DELETE'])
 def delete_item(item_id):
@@ -344,54 +572,70 @@ def delete_item(item_id):
     try:
         db = get_db()
         
-        # Check if item exists
-        cursor = db.execute('SELECT * FROM items WHERE id = ?', (item_id,))
-        item = cursor.fetchone()
+        # Delete the item; no affected row means it did not exist
+        cursor = db.execute(SQL_DELETE, (item_id,))
         
-        if item is None:
-            return jsonify({'error': 'Item not found'}), 404
+        if cursor.rowcount == 0:
+            return ojsonify({'error': 'Item not found'}), 404
         
-        # Delete the item
-        db.execute('DELETE FROM items WHERE id = ?', (item_id,))
         db.commit()
+        invalidate_caches()
         
         logger.info(f"Deleted item with ID: {item_id}")
-        return jsonify({'message': 'Item deleted successfully'})
+        return ojsonify({'message': 'Item deleted successfully'})
         
     except Exception as e:
         logger.error(f"Error deleting item {item_id}: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route('/items/categories', methods=['GET'])
 def get_categories():
     """Get all unique categories"""
+    global _categories_cache
     try:
-        db = get_db()
-        cursor = db.execute('SELECT DISTINCT category FROM items WHERE category IS NOT NULL ORDER BY category')
-        categories = [row[0] for row in cursor.fetchall()]
+        epoch = cache_epoch()
+        with _cache_lock:
+            cached = _categories_cache
+            generation = _cache_generation
+        
+        if cached is not None and cached[0] == epoch:
+            categories = cached[1]
+        else:
+            # Query outside the lock so writers never wait on it
+            db = get_db()
+            # Plain tuple rows, iterated straight off the cursor
+            cursor = db.execute(SQL_CATEGORIES)
+            cursor.row_factory = None
+            categories = [row[0] for row in cursor]
+            
+            # Publish only if no write happened while the query ran
+            with _cache_lock:
+                if _cache_generation == generation:
+                    _categories_cache = (epoch, categories)
         
-        return jsonify({'categories': categories})
+        return ojsonify({'categories': categories})
         
     except Exception as e:
         logger.error(f"Error getting categories: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({'error': 'Endpoint not found'}), 404
+    return ojsonify({'error': 'Endpoint not found'}), 404
 
 @app.errorhandler(405)
 def method_not_allowed(error):
     """Handle 405 errors"""
-    return jsonify({'error': 'Method not allowed'}), 405
+    return ojsonify({'error': 'Method not allowed'}), 405
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    return jsonify({'error': 'Internal server error'}), 500
+    return ojsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
+    # Development server only; use gunicorn with gunicorn_conf.py in production
     # Initialize database
     init_db()
     
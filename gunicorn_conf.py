@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration for the Flask CRUD API
+Usage: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers: SQLite calls block, so each worker serves requests on a
+# pool of threads, each with its own connection (see app.get_db)
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+def on_starting(server):
+    """Create the schema once in the master process, before workers fork"""
+    from app import init_db
+    init_db()
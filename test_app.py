@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the Flask CRUD API
+"""
+
+import base64
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import app as app_module
+from app import app, init_db, get_db, SORT_FIELDS
+
+
+def make_cursor(value):
+    """Encode an arbitrary JSON value the way cursors are encoded"""
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+class CursorPaginationTestCase(unittest.TestCase):
+    """Keyset (cursor) pagination on GET /items"""
+
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        app.config['DATABASE'] = os.path.join(self.db_dir, 'test.db')
+        app.config['TESTING'] = True
+        app_module._local.db = None
+        app_module.invalidate_caches()
+        init_db()
+
+        # Rows with repeated sort values, NULL prices and NULL categories
+        db = get_db()
+        for i in range(23):
+            db.execute(
+                'INSERT INTO items (name, description, category, price, quantity) VALUES (?, ?, ?, ?, ?)',
+                (
+                    f'Item {i % 4}',
+                    None,
+                    [None, 'Books', 'Tools'][i % 3],
+                    [None, 1.5, 2.0, 1.5, None][i % 5],
+                    i % 3
+                )
+            )
+        self.client = app.test_client()
+
+    def tearDown(self):
+        app_module._local.db.close()
+        app_module._local.db = None
+        shutil.rmtree(self.db_dir)
+
+    def walk(self, **params):
+        """Follow next_cursor to the end, returning the ids in order"""
+        ids = []
+        response = self.client.get('/items', query_string={**params, 'per_page': 4})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            ids.extend(item['id'] for item in data['items'])
+            next_cursor = data['pagination']['next_cursor']
+            if next_cursor is None:
+                return ids
+            response = self.client.get(
+                '/items', query_string={**params, 'per_page': 4, 'cursor': next_cursor}
+            )
+
+    def test_cursor_walk_matches_full_listing(self):
+        for sort_by in sorted(SORT_FIELDS):
+            for sort_order in ('asc', 'desc'):
+                with self.subTest(sort_by=sort_by, sort_order=sort_order):
+                    params = {'sort_by': sort_by, 'sort_order': sort_order}
+                    full = self.client.get('/items', query_string={**params, 'per_page': 100}).get_json()
+                    expected = [item['id'] for item in full['items']]
+                    self.assertEqual(len(expected), 28)  # 5 sample items + 23 above
+                    self.assertEqual(self.walk(**params), expected)
+
+    def test_cursor_walk_with_category_filter(self):
+        params = {'sort_by': 'price', 'sort_order': 'desc', 'category': 'Books'}
+        full = self.client.get('/items', query_string={**params, 'per_page': 100}).get_json()
+        self.assertEqual(self.walk(**params), [item['id'] for item in full['items']])
+
+    def test_malformed_cursor(self):
+        for cursor in ('not base64!', make_cursor('x'), make_cursor([1, 2, 3]), make_cursor([[1], 2]),
+                       make_cursor([{}, 2])):
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/items', query_string={'sort_by': 'price', 'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json()['error'], 'Invalid cursor')
+
+    def test_bool_cursor(self):
+        for value in ([True, 2], [1.5, True]):
+            with self.subTest(value=value):
+                response = self.client.get('/items', query_string={'sort_by': 'price', 'cursor': make_cursor(value)})
+                self.assertEqual(response.status_code, 400)
+
+    def test_out_of_range_int_cursor(self):
+        for value in ([1.5, 2 ** 63], [2 ** 63, 2], [1.5, -2 ** 63 - 1]):
+            with self.subTest(value=value):
+                response = self.client.get('/items', query_string={'sort_by': 'price', 'cursor': make_cursor(value)})
+                self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()